@@ -1,60 +1,94 @@
-import requests
+import httpx
+import orjson
+import asyncio
 import time
 import os
 
 MCP_SERVER_URL = "http://localhost:7070"
+REPORT_BATCH_URL = f"{MCP_SERVER_URL}/report_batch"
 CLUSTER_NAME = os.getenv("CLUSTER_NAME", "<your-cluster-name>")
-ES_ENDPOINT = "http://localhost:9200/_cluster/health"
+ES_ENDPOINT = "http://localhost:9200/_cluster/health?filter_path=status,cluster_name"  # only the fields we read
 CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", "30"))  # seconds
 
-def send_report(cluster, service, healthy, details="", consul_host="N/A"):
-    payload = {
-        "cluster": cluster,
-        "service": service,
-        "healthy": healthy,
-        "details": details,
-        "consul_host": consul_host
-    }
+# One long-lived client so probes and reports reuse keep-alive connections
+CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=8, max_connections=16)
+
+# Reports are posted by a background task so the probe loop never waits on MCP
+# Each queue item is one cycle's list of (service, healthy, details, host) tuples
+REPORT_QUEUE_SIZE = 64
+REPORT_BATCH_SIZE = 8  # cycles per POST
+
+def send_report(report_q, results):
     try:
-        requests.post(f"{MCP_SERVER_URL}/report", json=payload, timeout=3)
-        print(f"✅ Sent report for {service}: {'healthy' if healthy else 'unhealthy'}")
-    except Exception as e:
-        print(f"❌ Failed to send report for {service}: {e}")
+        report_q.put_nowait(results)
+    except asyncio.QueueFull:
+        print(f"❌ Report queue full, dropping reports for {', '.join(r[0] for r in results)}")
+
+async def report_worker(client, report_q):
+    while True:
+        # Wait for the first cycle, then coalesce whatever else is queued
+        cycles = [await report_q.get()]
+        while len(cycles) < REPORT_BATCH_SIZE:
+            try:
+                cycles.append(report_q.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        batch = [
+            {
+                "cluster": CLUSTER_NAME,
+                "service": service,
+                "healthy": healthy,
+                "details": details,
+                "consul_host": host
+            }
+            for results in cycles
+            for service, healthy, details, host in results
+        ]
+        try:
+            resp = await client.post(REPORT_BATCH_URL, json=batch, timeout=3)
+            resp.raise_for_status()
+            for payload in batch:
+                print(f"✅ Sent report for {payload['service']}: {'healthy' if payload['healthy'] else 'unhealthy'}")
+        except Exception as e:
+            print(f"❌ Failed to send {len(batch)} reports: {e}")
+        finally:
+            for _ in cycles:
+                report_q.task_done()
 
-def check_vault():
+async def check_vault(client):
     try:
-        resp = requests.get("http://localhost:8200/v1/sys/health", timeout=5)
+        resp = await client.get("http://localhost:8200/v1/sys/health")
         if resp.status_code == 200:
             return True, "Vault is responding normally"
         else:
             return False, f"Vault returned status code {resp.status_code}"
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         return False, "Connection refused - Vault may be down"
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return False, "Request timeout - Vault may be slow"
     except Exception as e:
         return False, f"Vault check error: {str(e)}"
 
-def check_consul():
+async def check_consul(client):
     try:
-        resp = requests.get("http://localhost:8500/v1/status/leader", timeout=5)
+        resp = await client.get("http://localhost:8500/v1/status/leader")
         if resp.status_code == 200 and resp.text.strip():
             leader = resp.text.strip().replace('"', '')
             return True, f"Consul leader: {leader}"
         else:
             return False, "No Consul leader found"
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         return False, "Connection refused - Consul may be down"
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return False, "Request timeout - Consul may be slow"
     except Exception as e:
         return False, f"Consul check error: {str(e)}"
 
-def check_elasticsearch():
+async def check_elasticsearch(client):
     try:
-        resp = requests.get(ES_ENDPOINT, timeout=5, verify=False)
+        resp = await client.get(ES_ENDPOINT)
         if resp.status_code == 200:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             status = data.get('status', 'unknown')
             cluster_name = data.get('cluster_name', 'unknown')
             if status == 'green':
@@ -65,43 +99,64 @@ def check_elasticsearch():
                 return False, f"Elasticsearch cluster '{cluster_name}' is {status}"
         else:
             return False, f"Elasticsearch returned status code {resp.status_code}"
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         return False, "Connection refused - Elasticsearch may be down"
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return False, "Request timeout - Elasticsearch may be slow"
     except Exception as e:
         return False, f"Elasticsearch check error: {str(e)}"
 
+# (service, host, check) for every probe run each cycle
+CHECKS = (
+    ("vault", "localhost:8200", check_vault),
+    ("consul", "localhost:8500", check_consul),
+    ("elasticsearch", "localhost:9200", check_elasticsearch),
+)
+
+async def run():
+    report_q = asyncio.Queue(maxsize=REPORT_QUEUE_SIZE)
+
+    async with httpx.AsyncClient(timeout=5.0, limits=CLIENT_LIMITS) as client:
+        worker = asyncio.create_task(report_worker(client, report_q))
+
+        try:
+            # Schedule cycles against the monotonic clock so check time doesn't stretch the interval
+            next_t = time.monotonic()
+            while True:
+                try:
+                    # Check Vault, Consul and Elasticsearch concurrently
+                    outcomes = await asyncio.gather(*(check(client) for _, _, check in CHECKS))
+                    send_report(report_q, [
+                        (service, healthy, details, host)
+                        for (service, host, _), (healthy, details) in zip(CHECKS, outcomes)
+                    ])
+
+                    next_t += CHECK_INTERVAL
+                    sleep_for = next_t - time.monotonic()
+                    if sleep_for > 0:
+                        print(f"🔄 Next check in {sleep_for:.1f} seconds...")
+                        await asyncio.sleep(sleep_for)
+                    else:
+                        next_t = time.monotonic()  # Overran the interval, start the next cycle now
+
+                except Exception as e:
+                    print(f"❌ Unexpected error in main loop: {e}")
+                    await asyncio.sleep(5)  # Short sleep before retrying
+                    next_t = time.monotonic()
+        finally:
+            worker.cancel()
+
 def main():
     print(f"🩺 Starting Infrastructure Health Agent")
     print(f"📊 Reporting to: {MCP_SERVER_URL}")
     print(f"🔄 Check interval: {CHECK_INTERVAL} seconds")
     print(f"🏗️ Cluster: {CLUSTER_NAME}")
     print("")
-    
-    while True:
-        try:
-            # Check Vault
-            vault_healthy, vault_details = check_vault()
-            send_report(CLUSTER_NAME, "vault", vault_healthy, vault_details, "localhost:8200")
-
-            # Check Consul
-            consul_healthy, consul_details = check_consul()
-            send_report(CLUSTER_NAME, "consul", consul_healthy, consul_details, "localhost:8500")
-
-            # Check Elasticsearch
-            es_healthy, es_details = check_elasticsearch()
-            send_report(CLUSTER_NAME, "elasticsearch", es_healthy, es_details, "localhost:9200")
-
-            print(f"🔄 Next check in {CHECK_INTERVAL} seconds...")
-            time.sleep(CHECK_INTERVAL)
-            
-        except KeyboardInterrupt:
-            print("\n🛑 Agent stopped by user")
-            break
-        except Exception as e:
-            print(f"❌ Unexpected error in main loop: {e}")
-            time.sleep(5)  # Short sleep before retrying
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n🛑 Agent stopped by user")
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,19 @@
 import requests
+from requests.adapters import HTTPAdapter
 
 MCP_SERVER_URL = "http://localhost:7070"
+REPORT_URL = f"{MCP_SERVER_URL}/report"
 CLUSTER_NAME = "<your-cluster-name>"
 ES_ENDPOINT = "http://localhost:9200/es1/_cluster/health"
 
+# Shared session so probes and reports reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update({"Connection": "keep-alive"})
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+GET = SESSION.get
+
 def send_report(cluster, service, healthy, details=""):
     payload = {
         "cluster": cluster,
@@ -12,13 +22,13 @@ def send_report(cluster, service, healthy, details=""):
         "details": details,
     }
     try:
-        requests.post(f"{MCP_SERVER_URL}/report", json=payload, timeout=3)
+        SESSION.post(REPORT_URL, json=payload, timeout=3)
     except Exception as e:
         print(f"Failed to send report for {service}: {e}")
 
 def check_vault():
     try:
-        resp = requests.get("http://localhost:8200/v1/sys/health", timeout=5)
+        resp = GET("http://localhost:8200/v1/sys/health", timeout=5)
         return resp.status_code == 200
     except Exception as e:
         print(f"Vault check error: {e}")
@@ -26,7 +36,7 @@ def check_vault():
 
 def check_consul():
     try:
-        resp = requests.get("http://localhost:8500/v1/status/leader", timeout=5)
+        resp = GET("http://localhost:8500/v1/status/leader", timeout=5)
         return resp.status_code == 200 and "8300" in resp.text
     except Exception as e:
         print(f"Consul check error: {e}")
@@ -34,7 +44,7 @@ def check_consul():
 
 def check_elasticsearch():
     try:
-        resp = requests.get(ES_ENDPOINT, timeout=5, verify=False)
+        resp = GET(ES_ENDPOINT, timeout=5)
         return resp.status_code == 200 and '"status"' in resp.text
     except Exception as e:
         print(f"Elasticsearch check error: {e}")
@@ -1,25 +1,56 @@
-from fastapi import FastAPI, Request, BackgroundTasks
+from fastapi import FastAPI, Request, BackgroundTasks, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import subprocess
 import signal
 import psutil
-from typing import Dict, Tuple, Optional
+import orjson
+from typing import Deque, Dict, List, Tuple, Optional
 import os
+import sys
 import logging
 import asyncio
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import urllib3
+from kubernetes import client, config, watch
+from kubernetes.client.rest import ApiException
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Kubernetes API clients share one pooled connection to the apiserver
+try:
+    config.load_incluster_config()
+except config.ConfigException:
+    try:
+        config.load_kube_config()
+    except Exception as e:
+        logger.warning(f"Could not load Kubernetes configuration: {e}")
+
+APPS = client.AppsV1Api()
+CORE = client.CoreV1Api()
+
 app = FastAPI()
 templates = Jinja2Templates(directory="templates")
 
 # In-memory stores
 status: Dict[str, Dict] = {}
-remediation_log = []
+_STATUS_SET = status.__setitem__
+remediation_log: Deque[Dict] = deque(maxlen=500)  # most recent remediations only
+
+# Running healthy-service count and serialized /api/status body, reset on every change
+_healthy_count = 0
+_status_cache_bytes: Optional[bytes] = None
+
+def log_remediation(entry: Dict):
+    """Append a remediation result and invalidate the cached status response"""
+    global _status_cache_bytes
+    remediation_log.append(entry)
+    _status_cache_bytes = None
 
 CLUSTER_NAME = os.getenv("CLUSTER_NAME", "<your-cluster-name>")
 
@@ -30,7 +61,80 @@ PORT_FORWARDS = {
     "elasticsearch": {"namespace": "elasticsearch", "service": "elasticsearch-master", "port": 9200}
 }
 
+# Port-forward processes started by this server, keyed by service
+_PF_PROCS: Dict[str, subprocess.Popen] = {}
+
+# Cached Elasticsearch discovery result: (namespace, statefulset, service)
+ES_CACHE_TTL = 600  # seconds
+_ES_CACHE: Dict = {"value": None, "ts": 0.0}
+
+def resource_exists(read_fn, *args, **kwargs) -> bool:
+    """Return True if a Kubernetes read call succeeds, False if the resource is missing"""
+    try:
+        read_fn(*args, **kwargs)
+        return True
+    except ApiException as e:
+        if e.status == 404:
+            return False
+        raise
+
+def invalidate_elasticsearch_cache():
+    """Forget the cached Elasticsearch location so the next lookup rediscovers it"""
+    _ES_CACHE["value"] = None
+
 def find_elasticsearch_resources() -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Find Elasticsearch StatefulSet and Service, reusing a recent discovery if available"""
+    if _ES_CACHE["value"] and time.time() - _ES_CACHE["ts"] < ES_CACHE_TTL:
+        logger.info(f"Using cached Elasticsearch location: {_ES_CACHE['value']}")
+        return _ES_CACHE["value"]
+
+    result = discover_elasticsearch_resources()
+    if result[0]:
+        _ES_CACHE["value"] = result
+        _ES_CACHE["ts"] = time.time()
+    return result
+
+def probe_elasticsearch_config(namespace: str, sts_name: str, svc_name: str) -> Optional[Tuple[str, str, str]]:
+    """Check one namespace/StatefulSet/Service combination, returning it if Elasticsearch lives there"""
+    try:
+        logger.debug(f"Checking {namespace}/{sts_name}")
+        
+        # Check if StatefulSet exists
+        if not resource_exists(APPS.read_namespaced_stateful_set, sts_name, namespace, _request_timeout=5):
+            return None
+        logger.info(f"Found StatefulSet: {sts_name} in namespace {namespace}")
+        
+        # Now find the corresponding service
+        # Try the exact service name first
+        if resource_exists(CORE.read_namespaced_service, svc_name, namespace, _request_timeout=5):
+            logger.info(f"Found Service: {svc_name} in namespace {namespace}")
+            return namespace, sts_name, svc_name
+        
+        # If exact service name not found, try to find any elasticsearch service
+        services = CORE.list_namespaced_service(namespace, _request_timeout=5).items
+        for svc in services:
+            service_name = svc.metadata.name
+            if 'elasticsearch' in service_name.lower():
+                logger.info(f"Found Elasticsearch service: {service_name} in namespace {namespace}")
+                return namespace, sts_name, service_name
+        
+        # If no service found, use the StatefulSet name as fallback
+        logger.warning(f"No service found for {sts_name}, will use StatefulSet name")
+        return namespace, sts_name, sts_name
+        
+    except Exception as e:
+        logger.debug(f"Error checking {namespace}/{sts_name}: {e}")
+        return None
+
+def namespace_exists(namespace: str) -> bool:
+    """Check whether a namespace exists, treating API errors as missing"""
+    try:
+        return resource_exists(CORE.read_namespace, namespace, _request_timeout=5)
+    except Exception as e:
+        logger.debug(f"Error checking namespace {namespace}: {e}")
+        return False
+
+def discover_elasticsearch_resources() -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """Dynamically find Elasticsearch StatefulSet and Service with retries"""
     
     # Possible namespace and resource name combinations
@@ -38,7 +142,6 @@ def find_elasticsearch_resources() -> Tuple[Optional[str], Optional[str], Option
         ("elasticsearch", "elasticsearch-master", "elasticsearch-master"),
         ("elasticsearch", "elasticsearch", "elasticsearch"),
         ("elasticsearch", "elasticsearch-master", "elasticsearch"),  # Mixed names
-        ("elasticsearch", "elasticsearch-master", "elasticsearch-master"),
         ("default", "elasticsearch", "elasticsearch"),
         ("logging", "elasticsearch", "elasticsearch"),
     ]
@@ -47,60 +150,26 @@ def find_elasticsearch_resources() -> Tuple[Optional[str], Optional[str], Option
     for attempt in range(3):
         logger.info(f"Elasticsearch detection attempt {attempt + 1}/3")
         
-        for namespace, sts_name, svc_name in search_configs:
-            try:
-                logger.debug(f"Checking {namespace}/{sts_name}")
-                
-                # Check if namespace exists first
-                ns_result = subprocess.run(
-                    ["kubectl", "get", "namespace", namespace],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                if ns_result.returncode != 0:
-                    logger.debug(f"Namespace {namespace} not found")
-                    continue
-                
-                # Check if StatefulSet exists
-                sts_result = subprocess.run(
-                    ["kubectl", "get", "statefulset", sts_name, "-n", namespace],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                if sts_result.returncode == 0:
-                    logger.info(f"Found StatefulSet: {sts_name} in namespace {namespace}")
-                    
-                    # Now find the corresponding service
-                    # Try the exact service name first
-                    svc_result = subprocess.run(
-                        ["kubectl", "get", "service", svc_name, "-n", namespace],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    
-                    if svc_result.returncode == 0:
-                        logger.info(f"Found Service: {svc_name} in namespace {namespace}")
-                        return namespace, sts_name, svc_name
-                    else:
-                        # If exact service name not found, try to find any elasticsearch service
-                        all_svc_result = subprocess.run(
-                            ["kubectl", "get", "svc", "-n", namespace, "-o", "name"],
-                            capture_output=True, text=True, timeout=5
-                        )
-                        
-                        if all_svc_result.returncode == 0:
-                            for line in all_svc_result.stdout.strip().split('\n'):
-                                service_name = line.replace('service/', '')
-                                if 'elasticsearch' in service_name.lower():
-                                    logger.info(f"Found Elasticsearch service: {service_name} in namespace {namespace}")
-                                    return namespace, sts_name, service_name
-                        
-                        # If no service found, use the StatefulSet name as fallback
-                        logger.warning(f"No service found for {sts_name}, will use StatefulSet name")
-                        return namespace, sts_name, sts_name
-                        
-            except Exception as e:
-                logger.debug(f"Error checking {namespace}/{sts_name}: {e}")
-                continue
+        # Probe every combination at once, but honour the list order when picking a match
+        executor = ThreadPoolExecutor(max_workers=len(search_configs))
+        try:
+            # Check each namespace once, then only probe combinations in namespaces that exist
+            namespaces = list(dict.fromkeys(ns for ns, _, _ in search_configs))
+            ns_found = dict(zip(namespaces, executor.map(namespace_exists, namespaces)))
+            for ns, found in ns_found.items():
+                if not found:
+                    logger.debug(f"Namespace {ns} not found")
+            
+            futures = [
+                executor.submit(probe_elasticsearch_config, *cfg)
+                for cfg in search_configs if ns_found[cfg[0]]
+            ]
+            for future in futures:
+                found = future.result()
+                if found:
+                    return found
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # Wait before next attempt
         if attempt < 2:
@@ -126,27 +195,61 @@ async def dashboard(request: Request):
         "remediation_log": remediation_log
     })
 
+def orjson_safe(value):
+    """Stringify integers outside orjson's 64-bit range, leaving everything else untouched"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if -(2 ** 63) <= value < 2 ** 64 else str(value)
+    if isinstance(value, dict):
+        return {k: orjson_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [orjson_safe(v) for v in value]
+    return value
+
+def store_report(report: dict) -> str:
+    """Record a single service report in the status store and return its key"""
+    global _healthy_count, _status_cache_bytes
+    # Keys repeat every cycle, so intern them to reuse one string per cluster/service
+    key = sys.intern(str(report["cluster"]) + "-" + str(report["service"]))
+    healthy = orjson_safe(report.get("healthy", False))
+    old = status.get(key)
+    _healthy_count += int(bool(healthy)) - int(bool(old and old["healthy"]))
+    _status_cache_bytes = None
+    _STATUS_SET(key, {
+        "healthy": healthy,
+        "details": orjson_safe(report.get("details", "")),
+        "consul_host": orjson_safe(report.get("consul_host", "N/A"))
+    })
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Received report for {key}: {'healthy' if healthy else 'unhealthy'}")
+    return key
+
 @app.post("/report")
 async def receive_report(report: dict):
-    key = f"{report['cluster']}-{report['service']}"
-    status[key] = {
-        "healthy": report.get("healthy", False),
-        "details": report.get("details", ""),
-        "consul_host": report.get("consul_host", "N/A")
-    }
-    logger.info(f"Received report for {key}: {'healthy' if report.get('healthy') else 'unhealthy'}")
+    key = store_report(report)
     return {"message": "Report received", "key": key}
 
+@app.post("/report_batch")
+async def receive_batch(reports: List[Dict]):
+    """Record several service reports in one request, rejecting the whole batch if any entry is invalid"""
+    invalid = [i for i, report in enumerate(reports) if "cluster" not in report or "service" not in report]
+    if invalid:
+        raise HTTPException(status_code=422, detail=f"Reports missing 'cluster' or 'service' at positions {invalid}")
+    keys = [store_report(report) for report in reports]
+    return {"message": f"{len(keys)} reports received", "keys": keys}
+
 @app.get("/api/status")
 async def get_status():
     """API endpoint to get current status"""
-    return {
-        "cluster": CLUSTER_NAME,
-        "status": status, 
-        "remediation_log": remediation_log,
-        "total_services": len(status),
-        "healthy_services": sum(1 for s in status.values() if s.get("healthy", False))
-    }
+    global _status_cache_bytes
+    if _status_cache_bytes is None:
+        _status_cache_bytes = orjson.dumps({
+            "cluster": CLUSTER_NAME,
+            "status": status, 
+            "remediation_log": list(remediation_log),
+            "total_services": len(status),
+            "healthy_services": _healthy_count
+        })
+    return Response(_status_cache_bytes, media_type="application/json")
 
 @app.post("/remediate/{service}")
 async def remediate_service(service: str, background_tasks: BackgroundTasks):
@@ -154,16 +257,24 @@ async def remediate_service(service: str, background_tasks: BackgroundTasks):
     background_tasks.add_task(remediate, service)
     return {"message": f"Remediation started for {service}", "service": service}
 
+def list_namespace_resources(namespace: str) -> List[str]:
+    """List StatefulSets, Services and Pods in a namespace as kind/name strings"""
+    return [
+        f"statefulset/{sts.metadata.name}"
+        for sts in APPS.list_namespaced_stateful_set(namespace, _request_timeout=10).items
+    ] + [
+        f"service/{svc.metadata.name}"
+        for svc in CORE.list_namespaced_service(namespace, _request_timeout=10).items
+    ] + [
+        f"pod/{pod.metadata.name}"
+        for pod in CORE.list_namespaced_pod(namespace, _request_timeout=10).items
+    ]
+
 def get_statefulset_replicas(name: str, namespace: str) -> int:
     """Get current replica count for a StatefulSet"""
     try:
-        result = subprocess.run(
-            ["kubectl", "get", "statefulset", name, "-n", namespace, "-o", "jsonpath={.spec.replicas}"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return int(result.stdout.strip())
-        return 0
+        sts = APPS.read_namespaced_stateful_set(name, namespace, _request_timeout=10)
+        return sts.spec.replicas or 0
     except Exception as e:
         logger.error(f"Error getting replicas for {name}: {e}")
         return 0
@@ -171,30 +282,91 @@ def get_statefulset_replicas(name: str, namespace: str) -> int:
 def scale_statefulset(name: str, namespace: str, replicas: int) -> bool:
     """Scale a StatefulSet to specified replicas"""
     try:
-        result = subprocess.run(
-            ["kubectl", "scale", "statefulset", name, "-n", namespace, f"--replicas={replicas}"],
-            check=True, capture_output=True, text=True, timeout=30
+        APPS.patch_namespaced_stateful_set_scale(
+            name, namespace, {"spec": {"replicas": replicas}}, _request_timeout=30
         )
-        logger.info(f"Scaled {name} in {namespace} to {replicas} replicas: {result.stdout.strip()}")
+        logger.info(f"Scaled {name} in {namespace} to {replicas} replicas")
         return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error scaling {name}: {e.stderr.strip() if e.stderr else str(e)}")
+    except ApiException as e:
+        logger.error(f"Error scaling {name}: {e.status} {e.reason}")
         return False
     except Exception as e:
         logger.error(f"Unexpected error scaling {name}: {e}")
         return False
 
+def statefulset_is_ready(sts) -> bool:
+    """True once a StatefulSet is ready, following the checks `kubectl rollout status` makes"""
+    desired = sts.spec.replicas or 0
+    st = sts.status
+    if not st.observed_generation or (sts.metadata.generation or 0) > st.observed_generation:
+        return False
+    if (st.ready_replicas or 0) < desired:
+        return False
+    
+    # Revisions only converge on their own for RollingUpdate
+    strategy = sts.spec.update_strategy
+    if not strategy or strategy.type != "RollingUpdate":
+        return True
+    
+    # Done once every replica above the partition (0 by default) is updated
+    if strategy.rolling_update is not None:
+        partition = strategy.rolling_update.partition or 0
+        return (st.updated_replicas or 0) >= desired - partition
+    return st.current_revision == st.update_revision
+
+def wait_for_statefulset_ready(name: str, namespace: str, timeout: int) -> bool:
+    """Block until a StatefulSet is fully rolled out and ready, or the timeout expires"""
+    w = watch.Watch()
+    try:
+        for event in w.stream(
+            APPS.list_namespaced_stateful_set, namespace=namespace,
+            field_selector=f"metadata.name={name}", timeout_seconds=timeout,
+            # Client-side bound too, in case the apiserver connection stalls
+            _request_timeout=timeout + 5
+        ):
+            if statefulset_is_ready(event["object"]):
+                logger.info(f"StatefulSet {name} in {namespace} is ready")
+                return True
+    except Exception as e:
+        logger.error(f"Error watching StatefulSet {name}: {e}")
+    finally:
+        w.stop()
+    return False
+
 def kill_port_forward(service: str):
     """Kill existing port-forward for a service"""
     try:
         port = PORT_FORWARDS[service]["port"]
-        # Kill by port pattern
-        result = subprocess.run(
-            ["pkill", "-f", f"kubectl port-forward.*{port}"],
-            capture_output=True, text=True
-        )
-        logger.info(f"Killed existing port-forward for {service} on port {port}")
-        time.sleep(2)  # Give it time to die
+        process = _PF_PROCS.pop(service, None)
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            logger.info(f"Killed port-forward for {service} on port {port} (PID: {process.pid})")
+            return
+        
+        # Not started by us (e.g. by run_all.sh), so look it up by command line
+        port_arg = f"{port}:{port}"
+        procs = [
+            p for p in psutil.process_iter(["cmdline"])
+            if p.info["cmdline"] and "port-forward" in p.info["cmdline"] and port_arg in p.info["cmdline"]
+        ]
+        for p in procs:
+            try:
+                p.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass  # Already gone or not ours; keep going so the others still die
+        gone, alive = psutil.wait_procs(procs, timeout=1)
+        for p in alive:
+            try:
+                p.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        if procs:
+            logger.info(f"Killed existing port-forward for {service} on port {port}")
     except Exception as e:
         logger.error(f"Error killing port-forward for {service}: {e}")
 
@@ -232,6 +404,7 @@ def start_port_forward(service: str, namespace: str = None, svc_name: str = None
         
         # Check if the process is still running
         if process.poll() is None:
+            _PF_PROCS[service] = process
             logger.info(f"Started port-forward for {service} on port {port} (PID: {process.pid})")
             return True
         else:
@@ -264,19 +437,16 @@ async def remediate(service: str):
             # First, let's see what we have in the elasticsearch namespace
             logger.info("Listing all resources in elasticsearch namespace:")
             try:
-                all_resources = subprocess.run(
-                    ["kubectl", "get", "all", "-n", "elasticsearch"],
-                    capture_output=True, text=True, timeout=10
-                )
-                if all_resources.returncode == 0:
-                    logger.info(f"Resources in elasticsearch namespace:\n{all_resources.stdout}")
+                resources = await asyncio.to_thread(list_namespace_resources, "elasticsearch")
+                if resources:
+                    logger.info("Resources in elasticsearch namespace:\n" + "\n".join(resources))
                 else:
                     logger.warning("No resources found in elasticsearch namespace or namespace doesn't exist")
             except Exception as e:
                 logger.error(f"Error listing elasticsearch resources: {e}")
             
             # Try dynamic detection
-            namespace, statefulset_name, service_name = find_elasticsearch_resources()
+            namespace, statefulset_name, service_name = await asyncio.to_thread(find_elasticsearch_resources)
             default_replicas = 3
             
             if not namespace or not statefulset_name:
@@ -291,11 +461,9 @@ async def remediate(service: str):
                 
                 for ns, sts in common_patterns:
                     try:
-                        check = subprocess.run(
-                            ["kubectl", "get", "statefulset", sts, "-n", ns],
-                            capture_output=True, text=True, timeout=5
-                        )
-                        if check.returncode == 0:
+                        if await asyncio.to_thread(
+                            resource_exists, APPS.read_namespaced_stateful_set, sts, ns, _request_timeout=5
+                        ):
                             namespace = ns
                             statefulset_name = sts
                             service_name = sts  # Use same name for service
@@ -312,7 +480,7 @@ async def remediate(service: str):
                     raise Exception(f"Elasticsearch not found. {error_details}Run 'kubectl get statefulset -A | grep -i elastic' to find it manually.")
                 
         else:
-            remediation_log.append({
+            log_remediation({
                 "cluster": CLUSTER_NAME,
                 "service": service,
                 "status": "failed",
@@ -324,50 +492,52 @@ async def remediate(service: str):
         logger.info(f"Using configuration: namespace={namespace}, statefulset={statefulset_name}, service={service_name}")
 
         # Check if StatefulSet exists
-        check_sts = subprocess.run(
-            ["kubectl", "get", "statefulset", statefulset_name, "-n", namespace],
-            capture_output=True, text=True, timeout=10
-        )
-        
-        if check_sts.returncode != 0:
-            raise Exception(f"StatefulSet {statefulset_name} not found in namespace {namespace}. Error: {check_sts.stderr.strip()}")
+        try:
+            await asyncio.to_thread(
+                APPS.read_namespaced_stateful_set, statefulset_name, namespace, _request_timeout=10
+            )
+        except ApiException as e:
+            raise Exception(f"StatefulSet {statefulset_name} not found in namespace {namespace}. Error: {e.status} {e.reason}")
 
         # Check current replica count
-        current_replicas = get_statefulset_replicas(statefulset_name, namespace)
+        current_replicas = await asyncio.to_thread(get_statefulset_replicas, statefulset_name, namespace)
         logger.info(f"{service} current replicas: {current_replicas}")
         
         # If scaled to 0, scale back up first
         if current_replicas == 0:
             logger.info(f"{service} is scaled to 0, scaling back up to {default_replicas}")
-            if not scale_statefulset(statefulset_name, namespace, default_replicas):
+            if not await asyncio.to_thread(scale_statefulset, statefulset_name, namespace, default_replicas):
                 raise Exception(f"Failed to scale {service} back up")
             
             # Wait for pods to start - longer for Elasticsearch
             wait_time = 60 if service == "elasticsearch" else 30
-            logger.info(f"Waiting {wait_time} seconds for {service} pods to start...")
-            await asyncio.sleep(wait_time)
+            logger.info(f"Waiting up to {wait_time} seconds for {service} pods to start...")
+            if not await asyncio.to_thread(wait_for_statefulset_ready, statefulset_name, namespace, wait_time):
+                logger.warning(f"{service} pods not ready after {wait_time} seconds, continuing")
         
         # Now perform rollout restart
         logger.info(f"Performing rollout restart for {service}")
-        result = subprocess.run(
-            ["kubectl", "rollout", "restart", f"statefulset/{statefulset_name}", "-n", namespace], 
-            check=True, capture_output=True, text=True, timeout=60
+        # Same annotation `kubectl rollout restart` sets to trigger a new rollout
+        restart_patch = {"spec": {"template": {"metadata": {"annotations": {
+            "kubectl.kubernetes.io/restartedAt": datetime.now(timezone.utc).isoformat()
+        }}}}}
+        await asyncio.to_thread(
+            APPS.patch_namespaced_stateful_set, statefulset_name, namespace, restart_patch, _request_timeout=60
         )
         
         # Wait for rollout to complete - longer for Elasticsearch
         rollout_wait = 90 if service == "elasticsearch" else 30
-        logger.info(f"Waiting {rollout_wait} seconds for {service} rollout to complete...")
-        await asyncio.sleep(rollout_wait)
+        logger.info(f"Waiting up to {rollout_wait} seconds for {service} rollout to complete...")
+        if not await asyncio.to_thread(wait_for_statefulset_ready, statefulset_name, namespace, rollout_wait):
+            logger.warning(f"{service} rollout not complete after {rollout_wait} seconds, continuing")
         
         # Wait for service to be ready
         logger.info(f"Checking if {service} service is ready...")
         for i in range(6):  # 1 minute max
             try:
-                check_svc = subprocess.run(
-                    ["kubectl", "get", "svc", service_name, "-n", namespace],
-                    capture_output=True, text=True, timeout=5
-                )
-                if check_svc.returncode == 0:
+                if await asyncio.to_thread(
+                    resource_exists, CORE.read_namespaced_service, service_name, namespace, _request_timeout=5
+                ):
                     logger.info(f"Service {service_name} is ready")
                     break
                 else:
@@ -378,7 +548,7 @@ async def remediate(service: str):
         
         # Restart port-forward
         logger.info(f"Restarting port-forward for {service}")
-        if start_port_forward(service, namespace, service_name):
+        if await asyncio.to_thread(start_port_forward, service, namespace, service_name):
             port_msg = f" Port-forward restarted on port {PORT_FORWARDS[service]['port']}."
         else:
             port_msg = " Warning: Failed to restart port-forward - you may need to restart manually."
@@ -392,7 +562,7 @@ async def remediate(service: str):
         message += port_msg
         message += f" Found in namespace: {namespace} as StatefulSet: {statefulset_name}."
         
-        remediation_log.append({
+        log_remediation({
             "cluster": CLUSTER_NAME,
             "service": service,
             "status": "success",
@@ -400,18 +570,22 @@ async def remediate(service: str):
         })
         logger.info(f"Successfully remediated {service}")
         
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Kubectl command failed: {e.stderr.strip() if e.stderr else str(e)}"
-        remediation_log.append({
+    except ApiException as e:
+        if service == "elasticsearch":
+            invalidate_elasticsearch_cache()
+        error_msg = f"Kubernetes API call failed: {e.status} {e.reason}"
+        log_remediation({
             "cluster": CLUSTER_NAME,
             "service": service,
             "status": "failed",
             "message": error_msg
         })
         logger.error(f"Remediation failed for {service}: {error_msg}")
-    except subprocess.TimeoutExpired:
+    except urllib3.exceptions.TimeoutError:
+        if service == "elasticsearch":
+            invalidate_elasticsearch_cache()
         error_msg = "Remediation command timed out"
-        remediation_log.append({
+        log_remediation({
             "cluster": CLUSTER_NAME,
             "service": service,
             "status": "failed",
@@ -419,8 +593,10 @@ async def remediate(service: str):
         })
         logger.error(f"Remediation timed out for {service}")
     except Exception as e:
+        if service == "elasticsearch":
+            invalidate_elasticsearch_cache()
         error_msg = f"Unexpected error during remediation: {str(e)}"
-        remediation_log.append({
+        log_remediation({
             "cluster": CLUSTER_NAME,
             "service": service,
             "status": "failed",
@@ -433,4 +609,5 @@ if __name__ == "__main__":
     print(f"Starting MCP Server on http://0.0.0.0:7070")
     print(f"Dashboard: http://localhost:7070/dashboard")
     print(f"API Status: http://localhost:7070/api/status")
-    uvicorn.run(app, host="0.0.0.0", port=7070, log_level="info")
\ No newline at end of file
+    # Single worker: status, remediation_log and port-forward handles live in this process
+    uvicorn.run(app, host="0.0.0.0", port=7070, loop="uvloop", http="httptools", workers=1, log_level="warning")
\ No newline at end of file
@@ -29,7 +29,7 @@ command -v kubectl >/dev/null || { echo "❌ kubectl not found"; exit 1; }
 command -v nc >/dev/null || { echo "❌ nc not found"; exit 1; }
 
 # Install Python deps if needed
-if ! python3 -c "import fastapi, uvicorn, requests" 2>/dev/null; then
+if ! python3 -c "import fastapi, uvicorn, requests, httpx, kubernetes, psutil, orjson, uvloop, httptools" 2>/dev/null; then
     echo "📦 Installing Python deps..."
     pip3 install -r requirements.txt
 fi